@@ -1,96 +1,220 @@
 import json
 import copy
-from typing import Any, Callable, Dict, Iterator, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from aqt import mw
 from aqt.qt import *
 
 from .window import ConfigWindow
 
+# Returned by ConfigManager._walk when the config doesn't exist.
+_MISSING = object()
+
 
 class ConfigManager:
     def __init__(self) -> None:
         self.config_window: Optional[ConfigWindow] = None
         self.window_open_hook: List[Callable[[ConfigWindow], None]] = []
         self._config: Dict
+        self._key_cache: Dict[str, Tuple[Tuple[str, Optional[int]], ...]] = {}
+        # Incremented whenever containers in _config may have been replaced.
+        self._config_version = 0
+        self._json_cache: Optional[str] = None
+        # False once set() stores a dict or list, which the caller may still mutate.
+        # Then neither to_json() nor parents from resolve() can be reused.
+        self._cacheable = True
+        self._mgr = mw.addonManager
         addon_dir = __name__.split(".")[0]
         self.addon_dir = addon_dir
         try:
-            self.addon_name = mw.addonManager.addon_meta(addon_dir).human_name()
+            self.addon_name = self._mgr.addon_meta(addon_dir).human_name()
         except:
-            self.addon_name = mw.addonManager.addonName(addon_dir)
-        self._default = mw.addonManager.addonConfigDefaults(addon_dir)
+            self.addon_name = self._mgr.addonName(addon_dir)
+        self._default = self._mgr.addonConfigDefaults(addon_dir)
+        # Config is pure json, so parsing is a faster deep copy than copy.deepcopy
+        self._default_json = json.dumps(self._default)
         self.load()
 
     def load(self) -> None:
         "Loads config from disk"
-        self._config = mw.addonManager.getConfig(self.addon_dir)
+        self._config = self._mgr.getConfig(self.addon_dir)
+        self._config_version += 1
+        self._json_cache = None
+        self._cacheable = True
 
     def save(self) -> None:
         "Writes its config data to disk."
-        mw.addonManager.writeConfig(self.addon_dir, self._config)
+        self._mgr.writeConfig(self.addon_dir, self._config)
 
     def load_defaults(self) -> None:
         "call .save() afterwards to restore defaults."
-        self._config = copy.deepcopy(self._default)
+        self._config = json.loads(self._default_json)
+        self._config_version += 1
+        self._json_cache = None
+        self._cacheable = True
 
     def to_json(self) -> str:
-        return json.dumps(self._config)
+        """The output is cached until the config is changed through this class.
+
+        Caching is turned off until the next load() once a dict or list was passed to set().
+        """
+        if not self._cacheable:
+            return json.dumps(self._config, separators=(",", ":"))
+        if self._json_cache is None:
+            self._json_cache = json.dumps(self._config, separators=(",", ":"))
+        return self._json_cache
+
+    @property
+    def config_version(self) -> int:
+        """Changes whenever containers in the config may have been replaced.
+
+        A parent returned by resolve() can be reused while this stays the same.
+        """
+        if not self._cacheable:
+            # A container passed to set() may have been changed by its caller.
+            self._config_version += 1
+        return self._config_version
+
+    def _levels(self, key: str) -> Tuple[Tuple[str, Optional[int]], ...]:
+        """Splits key into (dict key, list index) pairs. Cached per key.
+
+        List index is the level converted to int, or None if it isn't a number.
+        """
+        levels = self._key_cache.get(key)
+        if levels is None:
+            pairs = []
+            for level in key.split("."):
+                index: Optional[int]
+                try:
+                    index = int(level)
+                except ValueError:
+                    index = None
+                pairs.append((level, index))
+            levels = tuple(pairs)
+            self._key_cache[key] = levels
+        return levels
+
+    @staticmethod
+    def _list_index(level: str, index: Optional[int]) -> int:
+        "Raises ValueError if level isn't a list index"
+        if index is None:
+            return int(level)
+        return index
+
+    def _walk(self, dict_obj: dict, key: str) -> Any:
+        "Returns the config value without copying, or _MISSING if it doesn't exist"
+        if "." not in key:
+            return dict_obj.get(key, _MISSING)
+        return self._walk_levels(dict_obj, self._levels(key))
+
+    def _walk_levels(
+        self, value: Any, levels: Tuple[Tuple[str, Optional[int]], ...]
+    ) -> Any:
+        for level, index in levels:
+            if isinstance(value, list):
+                if index is None or not -len(value) <= index < len(value):
+                    return _MISSING
+                value = value[index]
+            elif isinstance(value, dict):
+                if level not in value:
+                    return _MISSING
+                value = value[level]
+            else:
+                return _MISSING
+        return value
 
     def get_from_dict(self, dict_obj: dict, key: str) -> Any:
         "Raises KeyError if config doesn't exist"
-        levels = key.split(".")
-        return_val = dict_obj
-        for level in levels:
-            if isinstance(return_val, list):
-                level = int(level)
-            return_val = return_val[level]
-        return copy.deepcopy(return_val)
+        value = self._walk(dict_obj, key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return copy.deepcopy(value)
+
+    def resolve(self, key: str) -> Tuple[Any, Union[str, int]]:
+        """Returns (parent, leaf) where parent[leaf] is the config value of key.
+
+        parent is the live config container. Don't modify it, use set() instead.
+        Raises KeyError if the parent doesn't exist, using the same rules as get().
+        The leaf may still be missing from a parent dict.
+        The result stays valid until config_version changes.
+        """
+        levels = self._levels(key)
+        parent = self._walk_levels(self._config, levels[:-1])
+        level, index = levels[-1]
+        if isinstance(parent, list):
+            if index is None or not -len(parent) <= index < len(parent):
+                raise KeyError(key)
+            return (parent, index)
+        if isinstance(parent, dict):
+            return (parent, level)
+        raise KeyError(key)
 
     def copy(self) -> Dict:
-        return copy.deepcopy(self._config)
+        return json.loads(json.dumps(self._config))
 
     def get(self, key: str, default: Any = None) -> Any:
         "Returns default or None if config dones't exist"
-        try:
-            return self.get_from_dict(self._config, key)
-        except KeyError:
+        value = self._walk(self._config, key)
+        if value is _MISSING:
             return default
+        return copy.deepcopy(value)
 
     def get_default(self, key: str) -> Any:
         return self.get_from_dict(self._default, key)
 
     def set(self, key: str, value: Any) -> None:
-        levels = key.split(".")
-        conf_obj = self._config
-        for i in range(len(levels) - 1):
-            level = levels[i]
+        conf_obj: Any = self._config
+        leaf: Union[str, int] = key
+        if "." in key:
+            levels = self._levels(key)
+            for level, index in levels[:-1]:
+                if isinstance(conf_obj, list):
+                    conf_obj = conf_obj[self._list_index(level, index)]
+                    continue
+                try:
+                    conf_obj = conf_obj[level]
+                except KeyError:
+                    conf_obj[level] = {}
+                    conf_obj = conf_obj[level]
+            level, index = levels[-1]
             if isinstance(conf_obj, list):
-                level = int(level)
-            try:
-                conf_obj = conf_obj[level]
-            except KeyError:
-                conf_obj[level] = {}
-                conf_obj = conf_obj[level]
-        level = levels[-1]
-        if isinstance(conf_obj, list):
-            level = int(level)
-        conf_obj[level] = value
+                leaf = self._list_index(level, index)
+            else:
+                leaf = level
+
+        try:
+            current = conf_obj[leaf]
+        except (KeyError, IndexError):
+            current = _MISSING
+        if isinstance(value, (dict, list)) or isinstance(current, (dict, list)):
+            # Widgets may have cached a container that is being replaced.
+            self._config_version += 1
+            if isinstance(value, (dict, list)):
+                self._cacheable = False
+        elif type(current) is type(value) and current == value:
+            # Skip writing the same value. Types are compared so 1 doesn't replace True.
+            return
+        self._json_cache = None
+        conf_obj[leaf] = value
 
     def pop(self, key: str) -> Any:
-        levels = key.split(".")
-        conf_obj = self._config
-        for i in range(len(levels) - 1):
-            level = levels[i]
+        self._json_cache = None
+        self._config_version += 1
+        if "." not in key:
+            return self._config.pop(key)
+        levels = self._levels(key)
+        conf_obj: Any = self._config
+        for level, index in levels[:-1]:
             if isinstance(conf_obj, list):
-                level = int(level)
+                conf_obj = conf_obj[self._list_index(level, index)]
+                continue
             try:
                 conf_obj = conf_obj[level]
             except KeyError:
                 return None
-        level = levels[-1]
+        level, index = levels[-1]
         if isinstance(conf_obj, list):
-            level = int(level)
+            return conf_obj.pop(self._list_index(level, index))
         return conf_obj.pop(level)
 
     def __getitem__(self, key: str) -> Any:
@@ -107,11 +231,7 @@ class ConfigManager:
         self.pop(key)
 
     def __contains__(self, key: str) -> bool:
-        try:
-            self.get_from_dict(self._config, key)
-            return True
-        except KeyError:
-            return False
+        return self._walk(self._config, key) is not _MISSING
 
     # Config Window
 
@@ -125,7 +245,7 @@ class ConfigManager:
         return True
 
     def use_custom_window(self) -> None:
-        mw.addonManager.setConfigAction(self.addon_dir, self.open_config)
+        self._mgr.setConfigAction(self.addon_dir, self.open_config)
 
     def on_window_open(self, fn: Callable[["ConfigWindow"], None]) -> None:
         self.window_open_hook.append(fn)
@@ -1,4 +1,4 @@
-from typing import Callable, List, Tuple, TYPE_CHECKING, Optional
+from typing import Any, Callable, Dict, List, Tuple, TYPE_CHECKING, Optional
 from pathlib import Path
 
 import aqt.addons
@@ -23,6 +23,9 @@ class ConfigWindow(QDialog):
         self.should_save_hook: List[Callable[[], bool]] = []
         self._on_save_hook: List[Callable[[], None]] = []
         self._on_close_hook: List[Callable[[], None]] = []
+        # True while widgets are being set from config, so their signals don't write it back.
+        self.updating_widgets = False
+        self._color_dialog: Optional[QColorDialog] = None
         self.geom_key = f"addonconfig-{conf.addon_name}"
 
         self.setWindowTitle(f"Config for {conf.addon_name}")
@@ -65,31 +68,48 @@ class ConfigWindow(QDialog):
         btn_box.addWidget(self.save_btn)
 
     def update_widgets(self) -> None:
+        # Error messages, without duplicates from widgets sharing a key
+        errors: List[str] = []
+        self.updating_widgets = True
         try:
             for widget_update in self.widget_updates:
-                widget_update()
+                try:
+                    widget_update()
+                except InvalidConfigValueError as e:
+                    if str(e) not in errors:
+                        errors.append(str(e))
         except Exception as e:
-            advanced = self.advanced_window()
-            dial, bbox = showText(
-                "Invalid Config. Please fix the following issue in the advanced config editor. \n\n"
-                + str(e),
-                title="Invalid Config",
-                parent=advanced,
-                run=False,
-            )
-            button = QPushButton("Quit Config")
-            bbox.addButton(button, QDialogButtonBox.ButtonRole.DestructiveRole)
-            bbox.button(QDialogButtonBox.StandardButton.Close).setDefault(True)
+            # Not a known invalid value, so the remaining widgets aren't updated.
+            errors.append(str(e))
+        finally:
+            self.updating_widgets = False
+        if not errors:
+            return
+
+        # Show every invalid value at once, so the advanced editor is opened only once.
+        advanced = self.advanced_window()
+        dial, bbox = showText(
+            "Invalid Config. Please fix the following "
+            + ("issues" if len(errors) > 1 else "issue")
+            + " in the advanced config editor. \n\n"
+            + "\n\n".join(errors),
+            title="Invalid Config",
+            parent=advanced,
+            run=False,
+        )
+        button = QPushButton("Quit Config")
+        bbox.addButton(button, QDialogButtonBox.ButtonRole.DestructiveRole)
+        bbox.button(QDialogButtonBox.StandardButton.Close).setDefault(True)
 
-            def quit() -> None:
-                self.widget_updates = []
-                dial.close()
-                advanced.reject()
-                self.close()
+        def quit() -> None:
+            self.widget_updates.clear()
+            dial.close()
+            advanced.reject()
+            self.close()
 
-            button.clicked.connect(quit)
-            dial.setModal(True)
-            dial.show()
+        button.clicked.connect(quit)
+        dial.setModal(True)
+        dial.show()
 
     def on_open(self) -> None:
         self.update_widgets()
@@ -117,6 +137,8 @@ class ConfigWindow(QDialog):
 
     def advanced_window(self) -> aqt.addons.ConfigEditor:
         def on_finish(result: int) -> None:
+            # ConfigEditor writes the edited config to disk without exposing it,
+            # so it has to be read back.
             self.conf.load()
             self.update_widgets()
 
@@ -145,6 +167,12 @@ class ConfigWindow(QDialog):
         self.main_tab.addTab(tab, name)
         return layout
 
+    def color_dialog(self) -> QColorDialog:
+        "Returns the QColorDialog shared by color inputs, creating it on first use."
+        if self._color_dialog is None:
+            self._color_dialog = QColorDialog(self)
+        return self._color_dialog
+
     def execute_on_save(self, hook: Callable[[], None]) -> None:
         self._on_save_hook.append(hook)
 
@@ -185,6 +213,47 @@ class ConfigLayout(QBoxLayout):
         self.config_window = conf_window
         self.widget_updates = conf_window.widget_updates
 
+    def _value_getter(self, key: str) -> Callable[[], Any]:
+        """Returns a function that returns the config value of key, or None if it doesn't exist.
+
+        The parent of the value is cached while conf.config_version stays the same.
+        """
+        conf = self.conf
+        version = -1
+        parent: Any = None
+        leaf: Any = None
+
+        def get_value() -> Any:
+            nonlocal version, parent, leaf
+            current_version = conf.config_version
+            if version != current_version:
+                try:
+                    parent, leaf = conf.resolve(key)
+                except KeyError:
+                    return None
+                version = current_version
+            try:
+                return parent[leaf]
+            except (KeyError, IndexError):
+                return None
+
+        return get_value
+
+    def _value_setter(self, key: str) -> Callable[[Any], None]:
+        """Returns a function that sets the config value of key.
+
+        Does nothing while the window is updating widgets from config,
+        as the value would be the one that was just read.
+        """
+        conf = self.conf
+        config_window = self.config_window
+
+        def set_value(value: Any) -> None:
+            if not config_window.updating_widgets:
+                conf.set(key, value)
+
+        return set_value
+
     # Config Input Widgets
 
     def checkbox(
@@ -197,20 +266,19 @@ class ConfigLayout(QBoxLayout):
         if tooltip is not None:
             checkbox.setToolTip(tooltip)
 
+        get_value = self._value_getter(key)
+
         def update() -> None:
-            value = self.conf.get(key)
+            value = get_value()
             if not isinstance(value, bool):
                 raise InvalidConfigValueError(key, "boolean", value)
             checkbox.setChecked(value)
 
         self.widget_updates.append(update)
 
-        checkbox.stateChanged.connect(
-            lambda s: self.conf.set(
-                key,
-                s == (Qt.CheckState.Checked.value if QT6 else Qt.CheckState.Checked),  # type: ignore
-            )
-        )
+        set_value = self._value_setter(key)
+        checked = Qt.CheckState.Checked.value if QT6 else Qt.CheckState.Checked
+        checkbox.stateChanged.connect(lambda s: set_value(s == checked))  # type: ignore
         self.addWidget(checkbox)
         return checkbox
 
@@ -227,22 +295,38 @@ class ConfigLayout(QBoxLayout):
         if tooltip is not None:
             combobox.setToolTip(tooltip)
 
+        # None if values can't be hashed, in which case values.index is used.
+        value_indexes: Optional[Dict[Any, int]] = {}
+        try:
+            for i, value in enumerate(values):
+                value_indexes.setdefault(value, i)
+        except TypeError:
+            value_indexes = None
+
+        conf = self.conf
+        get_value = self._value_getter(key)
+
         def update() -> None:
-            conf = self.conf
+            val = get_value()
             try:
-                val = conf.get(key)
-                index = values.index(val)
-            except ValueError:
+                if value_indexes is None:
+                    index = values.index(val)
+                else:
+                    index = value_indexes[val]
+            except (KeyError, ValueError, TypeError):
                 raise InvalidConfigValueError(
                     key, "any value in list " + str(values), val
                 )
             combobox.setCurrentIndex(index)
+            # Store the matching item of values, e.g. 1 instead of 1.0
+            shown = values[index]
+            if type(shown) is not type(val) or shown != val:
+                conf.set(key, shown)
 
         self.widget_updates.append(update)
 
-        combobox.currentIndexChanged.connect(
-            lambda idx: self.conf.set(key, values[idx])
-        )
+        set_value = self._value_setter(key)
+        combobox.currentIndexChanged.connect(lambda idx: set_value(values[idx]))
 
         if description is not None:
             row = self.hlayout()
@@ -263,8 +347,10 @@ class ConfigLayout(QBoxLayout):
         if tooltip is not None:
             line_edit.setToolTip(tooltip)
 
+        get_value = self._value_getter(key)
+
         def update() -> None:
-            val = self.conf.get(key)
+            val = get_value()
             if not isinstance(val, str):
                 raise InvalidConfigValueError(key, "string", val)
             line_edit.setText(val)
@@ -272,7 +358,7 @@ class ConfigLayout(QBoxLayout):
 
         self.widget_updates.append(update)
 
-        line_edit.textChanged.connect(lambda text: self.conf.set(key, text))
+        line_edit.textChanged.connect(self._value_setter(key))
 
         if description is not None:
             row = self.hlayout()
@@ -307,25 +393,38 @@ class ConfigLayout(QBoxLayout):
         spin_box.setMaximum(maximum)
         spin_box.setSingleStep(step)
 
+        value_types: Tuple[type, ...]
+        if decimal:
+            value_types = (int, float)
+            expected = "number"
+        else:
+            value_types = (int,)
+            expected = "integer number"
+
+        conf = self.conf
+        get_value = self._value_getter(key)
+
         def update() -> None:
-            val = self.conf.get(key)
-            if not decimal and not isinstance(val, int):
-                raise InvalidConfigValueError(key, "integer number", val)
-            if decimal and not isinstance(val, (int, float)):
-                raise InvalidConfigValueError(key, "number", val)
-            if minimum is not None and val < minimum:
+            val = get_value()
+            if not isinstance(val, value_types):
+                raise InvalidConfigValueError(key, expected, val)
+            if val < minimum:
                 raise InvalidConfigValueError(
                     key, f"integer number greater or equal to {minimum}", val
                 )
-            if maximum is not None and val > maximum:
+            if val > maximum:
                 raise InvalidConfigValueError(
                     key, f"integer number lesser or equal to {maximum}", val
                 )
             spin_box.setValue(val)
+            # Store the value as shown, e.g. rounded to precision or as float
+            shown = spin_box.value()
+            if type(shown) is not type(val) or shown != val:
+                conf.set(key, shown)
 
         self.widget_updates.append(update)
 
-        spin_box.valueChanged.connect(lambda val: self.conf.set(key, val))
+        spin_box.valueChanged.connect(self._value_setter(key))
 
         if description is not None:
             row = self.hlayout()
@@ -370,8 +469,11 @@ class ConfigLayout(QBoxLayout):
             if not color.isValid():
                 raise InvalidConfigValueError(key, "rgb hex color string", rgb)
 
+        get_value = self._value_getter(key)
+        set_value = self._value_setter(key)
+
         def update() -> None:
-            value = self.conf.get(key)
+            value = get_value()
             set_color(value)
 
         def save(color: QColor) -> None:
@@ -380,16 +482,20 @@ class ConfigLayout(QBoxLayout):
                 rgb = "#" + rgb[3:] + rgb[1:3]  # ARGB to RGBA
             else:
                 rgb = color.name()
-            self.conf.set(key, rgb)
+            set_value(rgb)
             set_color(rgb)
 
         def open_color_dialog() -> None:
-            color_dialog = QColorDialog(self.config_window)
-            if opacity:
-                color_dialog.setOptions(QColorDialog.ColorDialogOption.ShowAlphaChannel)
+            color_dialog = self.config_window.color_dialog()
+            color_dialog.setOption(
+                QColorDialog.ColorDialogOption.ShowAlphaChannel, opacity
+            )
             color_dialog.setCurrentColor(color)
-            color_dialog.colorSelected.connect(lambda c: save(c))
-            color_dialog.exec()
+            color_dialog.colorSelected.connect(save)
+            try:
+                color_dialog.exec()
+            finally:
+                color_dialog.colorSelected.disconnect(save)
 
         self.widget_updates.append(update)
 
@@ -428,14 +534,17 @@ class ConfigLayout(QBoxLayout):
         if tooltip is not None:
             line_edit.setToolTip(tooltip)
 
+        get_value = self._value_getter(key)
+        set_value = self._value_setter(key)
+
         def update() -> None:
-            val = self.conf.get(key)
+            val = get_value()
             if not isinstance(val, str):
                 raise InvalidConfigValueError(key, "string file path", val)
             line_edit.setText(val)
 
         def get_path() -> None:
-            val = self.conf.get(key)
+            val = get_value()
             parent_dir = str(Path(val).parent)
 
             if get_directory:
@@ -447,7 +556,7 @@ class ConfigLayout(QBoxLayout):
                     self.config_window, directory=parent_dir, filter=filter
                 )[0]
             if path:  # is None if cancelled
-                self.conf.set(key, path)
+                set_value(path)
                 update()
 
         self.widget_updates.append(update)
@@ -464,8 +573,10 @@ class ConfigLayout(QBoxLayout):
             row = self.hlayout()
             row.text(description, tooltip=tooltip)
 
+        get_value = self._value_getter(key)
+
         def update() -> None:
-            val = self.conf.get(key)
+            val = get_value()
             if not isinstance(val, str):
                 raise InvalidConfigValueError(key, "str", val)
             val = val.replace(" ", "")
@@ -473,8 +584,9 @@ class ConfigLayout(QBoxLayout):
 
         self.widget_updates.append(update)
 
+        conf = self.conf
         edit.keySequenceChanged.connect(  # type: ignore
-            lambda s: self.conf.set(key, edit.keySequence().toString())
+            lambda s: conf.set(key, edit.keySequence().toString())
         )
 
         def on_shortcut_clear_btn_click() -> None: